@@ -9,18 +9,66 @@ Writes a CSV with one row per matching worklog entry.
 from __future__ import annotations
 
 import argparse
-import base64
-import configparser
-import csv
-import json
+import functools
 import os
+import re
 import sys
-import urllib.error
+import threading
+import time
 import urllib.parse
-import urllib.request
-from dataclasses import dataclass
-from datetime import date, datetime
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from collections import deque
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime, timedelta
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    Union,
+)
+
+# Modules only needed once an export actually runs (http.client, csv, ...) are
+# imported inside the functions that use them, so --help and configuration
+# errors return quickly.
+if TYPE_CHECKING:
+    import http.client
+    from concurrent.futures import Executor, Future
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+_RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+_MAX_RETRIES = 3
+_RETRY_BACKOFF_SECONDS = 0.3
+_DEFAULT_MAX_WORKERS = 8
+_JQL_BATCH_SIZE = 100
+_WORKLOG_PAGE_SIZE = 1000
+_WORKLOG_AUTHOR_FIELDS = ("accountId", "emailAddress", "name", "displayName")
+_CSV_BUFFER_SIZE = 1 << 20
+_CACHE_MAX_AGE_SECONDS = 30 * 86_400
+_CSV_HEADER: Tuple[str, ...] = (
+    "JIRA Identifier (Issue Key)",
+    "Time Spent",
+    "Time Spent In Hours",
+    "UserName",
+    "Worklog Date",
+)
+_EPOCH = date(1970, 1, 1)
+
+ConfigSource = Union[str, "os.PathLike[str]", TextIO]
+_is_cache_file_name = re.compile(r"[0-9a-f]{64}\.json(\.[0-9]+\.[0-9]+\.tmp)?").fullmatch
+# (issue key, seconds spent, author name, worklog date); one CSV row each.
+TimeEntry = Tuple[str, int, str, Optional[date]]
+_needs_csv_quoting = re.compile(r'[,"\r\n]').search
 
 
 @dataclass(frozen=True)
@@ -30,6 +78,14 @@ class JiraConfig:
     api_token: str
     worklog_user: str
     api_version: str = "3"
+    max_workers: int = _DEFAULT_MAX_WORKERS
+    auth_header: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Encoded once per config rather than per request.
+        object.__setattr__(
+            self, "auth_header", f"Basic {_build_auth_header(self.email, self.api_token)}"
+        )
 
 
 class JiraApiError(RuntimeError):
@@ -40,12 +96,82 @@ class JiraApiError(RuntimeError):
         self.message = message
 
 
-def _read_config_file(path: str) -> Dict[str, str]:
-    parser = configparser.ConfigParser()
-    read_files = parser.read(path)
-    if not read_files:
-        raise FileNotFoundError(f"Config file not found: {path}")
+def _read_config_file(source: ConfigSource) -> Dict[str, str]:
+    if hasattr(source, "read"):
+        return _parse_config_text(source.read())
+
+    path = os.fspath(source)
+    try:
+        stat_result = os.stat(path)
+    except OSError as exc:
+        raise FileNotFoundError(f"Config file not found: {path}") from exc
+    # Parsed values are cached until the file changes; hand out a copy so
+    # callers cannot mutate the cached dict.
+    return dict(_parse_config_file(path, stat_result.st_mtime_ns, stat_result.st_size))
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_config_file(path: str, mtime_ns: int, size: int) -> Dict[str, str]:
+    try:
+        with open(path) as file_handle:
+            text = file_handle.read()
+    except OSError as exc:
+        raise FileNotFoundError(f"Config file not found: {path}") from exc
+    return _parse_config_text(text)
+
+
+def _parse_config_text(text: str) -> Dict[str, str]:
+    values = _parse_simple_jira_section(text)
+    if values is None:
+        values = _parse_jira_section_with_configparser(text)
+    return values
 
+
+def _parse_simple_jira_section(text: str) -> Optional[Dict[str, str]]:
+    """Read the [jira] section of a plain ``key = value`` INI file in one pass.
+
+    Returns None for anything outside that subset (continuation lines,
+    [DEFAULT], interpolation, duplicates, ...) so the caller can fall back to
+    configparser, which is far slower to import and run.
+    """
+    jira_values: Optional[Dict[str, str]] = None
+    section: Optional[str] = None
+    seen = set()
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line or line[0] in "#;":
+            continue
+        if raw_line[0].isspace() or "%" in line:
+            return None
+        if line[0] == "[":
+            section = line[1:-1] if line[-1] == "]" else None
+            if not section or section == "DEFAULT" or section in seen:
+                return None
+            seen.add(section)
+            if section == "jira":
+                jira_values = {}
+            continue
+        delimiters = [index for index in (line.find("="), line.find(":")) if index >= 0]
+        if section is None or not delimiters or min(delimiters) == 0:
+            return None
+        index = min(delimiters)
+        key = line[:index].strip().lower()
+        if (section, key) in seen:
+            return None
+        seen.add((section, key))
+        if jira_values is not None and section == "jira":
+            jira_values[key] = line[index + 1 :].strip()
+
+    if jira_values is None:
+        raise ValueError("Config file missing [jira] section")
+    return jira_values
+
+
+def _parse_jira_section_with_configparser(text: str) -> Dict[str, str]:
+    import configparser
+
+    parser = configparser.ConfigParser()
+    parser.read_string(text)
     if "jira" not in parser:
         raise ValueError("Config file missing [jira] section")
 
@@ -67,7 +193,11 @@ def _env_or_config(
     return default
 
 
-def load_jira_config(config_path: Optional[str]) -> JiraConfig:
+def load_jira_config(config_path: Optional[ConfigSource]) -> JiraConfig:
+    """Load settings from the environment and an optional INI config.
+
+    ``config_path`` may be a path or an already-open text file object.
+    """
     config_values: Dict[str, str] = {}
     if config_path:
         config_values = _read_config_file(config_path)
@@ -93,74 +223,481 @@ def load_jira_config(config_path: Optional[str]) -> JiraConfig:
     if not worklog_user:
         raise ValueError("Missing JIRA_WORKLOG_USER or worklog_user in config")
 
+    max_workers = _parse_max_workers(
+        _env_or_config(
+            "JIRA_MAX_WORKERS",
+            "max_workers",
+            config_values,
+            default=str(_DEFAULT_MAX_WORKERS),
+        )
+    )
+
     return JiraConfig(
         base_url=base_url.rstrip("/"),
         email=email,
         api_token=api_token,
         worklog_user=worklog_user,
         api_version=api_version,
+        max_workers=max_workers,
     )
 
 
+def _parse_max_workers(raw_value: Optional[str]) -> int:
+    try:
+        max_workers = int(raw_value or "")
+    except ValueError as exc:
+        raise ValueError("max_workers must be a positive integer") from exc
+    if max_workers < 1:
+        raise ValueError("max_workers must be a positive integer")
+    return max_workers
+
+
 def _build_auth_header(email: str, api_token: str) -> str:
+    import base64
+
     auth_bytes = f"{email}:{api_token}".encode("utf-8")
     return base64.b64encode(auth_bytes).decode("ascii")
 
 
-def _jira_get_json(base_url: str, auth_header: str, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
-    query = urllib.parse.urlencode(params)
-    url = f"{base_url}{path}?{query}" if query else f"{base_url}{path}"
-    request = urllib.request.Request(url)
-    request.add_header("Authorization", f"Basic {auth_header}")
-    request.add_header("Accept", "application/json")
+class _ResponseCache:
+    """On-disk ETag cache so unchanged pages come back as 304 Not Modified.
+
+    ``etags.json`` maps each request URL to its last ETag; response bodies are
+    stored beside it, one file per URL. Bodies not stored or revalidated for
+    ``_CACHE_MAX_AGE_SECONDS`` are pruned when the index is saved.
+    """
 
+    def __init__(self, directory: str) -> None:
+        directory = os.path.expanduser(directory)
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._index_path = os.path.join(directory, "etags.json")
+        self._lock = threading.Lock()
+        self._store_failed = False
+        try:
+            with open(self._index_path, "rb") as file_handle:
+                self._etags: Dict[str, str] = _json_loads(file_handle.read())
+        except (OSError, ValueError):
+            self._etags = {}
+
+    def _body_path(self, url: str) -> str:
+        import hashlib
+
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self._directory, f"{digest}.json")
+
+    def etag(self, url: str) -> Optional[str]:
+        with self._lock:
+            return self._etags.get(url)
+
+    def load(self, url: str) -> Optional[bytes]:
+        body_path = self._body_path(url)
+        try:
+            with open(body_path, "rb") as file_handle:
+                body = file_handle.read()
+        except OSError:
+            with self._lock:
+                self._etags.pop(url, None)
+            return None
+        try:
+            # The body's mtime records its last use for pruning.
+            os.utime(body_path)
+        except OSError:
+            pass
+        return body
+
+    def store(self, url: str, etag: str, body: bytes) -> None:
+        try:
+            _write_atomic(self._body_path(url), body)
+        except OSError as exc:
+            # A full or read-only disk only costs the next run a refetch.
+            with self._lock:
+                first_failure, self._store_failed = not self._store_failed, True
+            if first_failure:
+                print(f"Warning: could not write response cache: {exc}", file=sys.stderr)
+            return
+        with self._lock:
+            self._etags[url] = etag
+
+    def save(self) -> None:
+        import json
+
+        self._prune()
+        with self._lock:
+            index = json.dumps(self._etags, indent=2, sort_keys=True)
+        _write_atomic(self._index_path, index.encode("utf-8"))
+
+    def _prune(self) -> None:
+        cutoff = time.time() - _CACHE_MAX_AGE_SECONDS
+        removed = set()
+        with os.scandir(self._directory) as entries:
+            for entry in entries:
+                if not _is_cache_file_name(entry.name):
+                    continue
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                        removed.add(entry.path)
+                except OSError:
+                    continue
+        if removed:
+            with self._lock:
+                self._etags = {
+                    url: etag
+                    for url, etag in self._etags.items()
+                    if self._body_path(url) not in removed
+                }
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
     try:
-        with urllib.request.urlopen(request, timeout=30) as response:
-            payload = response.read().decode("utf-8")
-            return json.loads(payload)
-    except urllib.error.HTTPError as exc:
-        body = exc.read().decode("utf-8", errors="ignore") if exc.fp else ""
-        raise JiraApiError(exc.code, url, body) from exc
-    except urllib.error.URLError as exc:
+        with open(temp_path, "wb") as file_handle:
+            file_handle.write(data)
+        os.replace(temp_path, path)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _proxy_for(
+    scheme: str, hostname: str
+) -> Optional[Tuple[str, Optional[int], Dict[str, str]]]:
+    """Return ``(host, port, headers)`` of the proxy for ``scheme``, if any.
+
+    Mirrors urllib's handling of the *_proxy environment variables: a value
+    without a scheme is taken as ``http://`` and credentials in it are sent
+    as Proxy-Authorization.
+    """
+    import urllib.request
+
+    proxy = urllib.request.getproxies().get(scheme)
+    if not proxy or urllib.request.proxy_bypass(hostname):
+        return None
+    if "://" not in proxy:
+        proxy = f"http://{proxy}"
+    parts = urllib.parse.urlsplit(proxy)
+    if not parts.hostname:
+        return None
+    headers: Dict[str, str] = {}
+    if parts.username is not None:
+        credentials = _build_auth_header(
+            urllib.parse.unquote(parts.username),
+            urllib.parse.unquote(parts.password or ""),
+        )
+        headers["Proxy-Authorization"] = f"Basic {credentials}"
+    return parts.hostname, parts.port, headers
+
+
+class _JiraSession:
+    """Pool of keep-alive HTTP connections reused for requests to one JIRA host.
+
+    ``urllib.request.urlopen`` opens a new TCP + TLS connection per call, which
+    dominates runtime when walking many worklog pages across many issues.
+    Connections are checked out per request, so one session can be shared by
+    worker threads.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        authorization: str,
+        timeout: float = 30,
+        cache_dir: Optional[str] = None,
+    ) -> None:
+        parts = urllib.parse.urlsplit(base_url)
+        self.base_url = base_url
+        self._scheme = parts.scheme
+        self._netloc = parts.netloc
+        self._hostname = parts.hostname or ""
+        self._base_path = parts.path.rstrip("/")
+        self._timeout = timeout
+        self._headers = {
+            "Authorization": authorization,
+            "Accept": "application/json",
+        }
+        self._request_prefix = self._base_path
+        self._proxy = _proxy_for(self._scheme, self._hostname)
+        if self._proxy is not None and self._scheme != "https":
+            # Plain HTTP goes through the proxy as absolute-URI requests;
+            # only HTTPS is tunnelled with CONNECT.
+            self._request_prefix = f"{self._scheme}://{self._netloc}{self._base_path}"
+            self._headers.update(self._proxy[2])
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        self._cache = _ResponseCache(cache_dir) if cache_dir else None
+
+    def __enter__(self) -> "_JiraSession":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._close_idle()
+        if self._cache is not None:
+            # The cache only saves work on the next run; failing to record it
+            # must not fail this export or mask the error that ended it.
+            try:
+                self._cache.save()
+            except OSError as exc:
+                print(f"Warning: could not save response cache: {exc}", file=sys.stderr)
+
+    def _close_idle(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+    def _connect(self) -> http.client.HTTPConnection:
+        import http.client
+
+        if self._proxy is None:
+            if self._scheme == "https":
+                return http.client.HTTPSConnection(self._netloc, timeout=self._timeout)
+            return http.client.HTTPConnection(self._netloc, timeout=self._timeout)
+        proxy_host, proxy_port, proxy_headers = self._proxy
+        if self._scheme == "https":
+            connection = http.client.HTTPSConnection(
+                proxy_host, proxy_port, timeout=self._timeout
+            )
+            connection.set_tunnel(self._netloc, headers=proxy_headers)
+            return connection
+        return http.client.HTTPConnection(proxy_host, proxy_port, timeout=self._timeout)
+
+    def get(self, target: str) -> Tuple[int, bytes]:
+        """GET ``target`` (path plus query) and return ``(status, body)``.
+
+        If a reused keep-alive connection turns out to have been dropped by
+        the server, the other idle connections are discarded as likely stale
+        too and the request is retried once on a fresh connection. Timeouts
+        are not retried. Throttling/5xx responses are retried with backoff.
+        With a cache, a 304 Not Modified is answered from the cached body.
+        """
+        import http.client
+        import socket
+
+        url = f"{self.base_url}{target}"
+        attempt = 0
+        force_new_connection = False
+        while True:
+            headers = self._headers
+            etag = self._cache.etag(url) if self._cache is not None else None
+            if etag:
+                headers = {**headers, "If-None-Match": etag}
+            connection = None
+            if not force_new_connection:
+                with self._lock:
+                    connection = self._idle.pop() if self._idle else None
+            reused = connection is not None
+            if connection is None:
+                connection = self._connect()
+            try:
+                connection.request(
+                    "GET", f"{self._request_prefix}{target}", headers=headers
+                )
+                response = connection.getresponse()
+                body = response.read()
+            except (OSError, http.client.HTTPException) as exc:
+                connection.close()
+                if reused and not isinstance(exc, socket.timeout):
+                    self._close_idle()
+                    force_new_connection = True
+                    continue
+                raise
+            force_new_connection = False
+            if response.will_close:
+                connection.close()
+            else:
+                with self._lock:
+                    self._idle.append(connection)
+            if response.status in _RETRY_STATUS_CODES and attempt < _MAX_RETRIES:
+                time.sleep(_retry_delay(response.getheader("Retry-After"), attempt))
+                attempt += 1
+                continue
+            if self._cache is not None:
+                if response.status == 304:
+                    cached_body = self._cache.load(url)
+                    if cached_body is None:
+                        # Body went missing; load() dropped the ETag, so ask again.
+                        continue
+                    return 200, cached_body
+                new_etag = response.getheader("ETag")
+                if response.status == 200 and new_etag:
+                    self._cache.store(url, new_etag, body)
+            return response.status, body
+
+
+def _retry_delay(retry_after: Optional[str], attempt: int) -> float:
+    """Seconds to wait before retry ``attempt`` (0-based).
+
+    A Retry-After header, in seconds or as an HTTP date, is honoured as
+    urllib3's Retry does; otherwise the delay backs off exponentially.
+    """
+    if retry_after:
+        retry_after = retry_after.strip()
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        from email.utils import parsedate_to_datetime
+
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            retry_at = None
+        if retry_at is not None and retry_at.tzinfo is not None:
+            return max(0.0, retry_at.timestamp() - time.time())
+    return _RETRY_BACKOFF_SECONDS * (2**attempt)
+
+
+def _jira_get_json(
+    session: _JiraSession, path: str, params: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    import http.client
+
+    query = urllib.parse.urlencode(params) if params else ""
+    target = f"{path}?{query}" if query else path
+    url = f"{session.base_url}{target}"
+
+    try:
+        status, body = session.get(target)
+    except (OSError, http.client.HTTPException) as exc:
         raise RuntimeError(f"Network error while calling {url}: {exc}") from exc
+    if status >= 400:
+        raise JiraApiError(status, url, body.decode("utf-8", errors="ignore"))
+    if status >= 300:
+        # Redirects are not followed; the usual cause is an http:// base_url.
+        raise JiraApiError(
+            status, url, "unexpected redirect; check base_url (e.g. use https://)"
+        )
+    return _json_loads(body)
+
+
+def _started_range_params(
+    start_date: Optional[date], end_date: Optional[date]
+) -> Dict[str, int]:
+    """Build JIRA's startedAfter/startedBefore filters (epoch milliseconds).
+
+    Narrowing the range server-side keeps out-of-range worklogs off the wire.
+    The window is widened by a day on each side because worklog dates are
+    taken in the worklog's own UTC offset; the client-side filter stays
+    authoritative.
+    """
+    params: Dict[str, int] = {}
+    if start_date:
+        params["startedAfter"] = _epoch_millis(start_date - timedelta(days=1))
+    if end_date:
+        params["startedBefore"] = _epoch_millis(end_date + timedelta(days=2))
+    return params
+
+
+def _epoch_millis(day: date) -> int:
+    return (day - _EPOCH).days * 86_400_000
+
+
+def _worklog_page_fetcher(
+    session: _JiraSession,
+    api_version: str,
+    issue_key: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> Callable[[int], Dict[str, Any]]:
+    # Only startAt changes between pages, so encode the rest of the query once.
+    static_query = urllib.parse.urlencode(
+        {"maxResults": _WORKLOG_PAGE_SIZE, **_started_range_params(start_date, end_date)}
+    )
+    page_path = f"/rest/api/{api_version}/issue/{issue_key}/worklog?{static_query}&startAt="
+
+    def fetch_page(start_at: int) -> Dict[str, Any]:
+        data = _jira_get_json(session, f"{page_path}{start_at}")
+        data["worklogs"] = [_slim_worklog(worklog) for worklog in data.get("worklogs", [])]
+        return data
+
+    return fetch_page
+
+
+def _slim_worklog(worklog: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the worklog fields the export reads.
+
+    Worklogs carry comment bodies, visibility, update authors, etc. Dropping
+    them as soon as a page is parsed keeps pages buffered by concurrent
+    fetches small.
+    """
+    author = worklog.get("author") or {}
+    return {
+        "author": {key: author[key] for key in _WORKLOG_AUTHOR_FIELDS if key in author},
+        "started": worklog.get("started"),
+        "timeSpentSeconds": worklog.get("timeSpentSeconds", 0),
+    }
 
 
 def _iter_worklogs(
-    base_url: str,
-    auth_header: str,
+    session: _JiraSession,
     api_version: str,
     issue_key: str,
+    executor: Optional[Executor] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
 ) -> Iterable[Dict[str, Any]]:
-    start_at = 0
-    max_results = 100
-
-    while True:
-        path = f"/rest/api/{api_version}/issue/{issue_key}/worklog"
-        data = _jira_get_json(
-            base_url,
-            auth_header,
-            path,
-            {"startAt": start_at, "maxResults": max_results},
-        )
-        worklogs = data.get("worklogs", [])
-        for entry in worklogs:
-            yield entry
+    fetch_page = _worklog_page_fetcher(
+        session, api_version, issue_key, start_date, end_date
+    )
+    return _iter_worklog_pages(fetch_page, executor)
 
-        total = data.get("total", 0)
-        start_at += len(worklogs)
-        if start_at >= total or not worklogs:
-            break
 
+def _iter_worklog_pages(
+    fetch_page: Callable[[int], Dict[str, Any]],
+    executor: Optional[Executor] = None,
+    first_page: Optional[Future] = None,
+    max_pages_ahead: int = _DEFAULT_MAX_WORKERS,
+) -> Iterable[Dict[str, Any]]:
+    data = first_page.result() if first_page is not None else fetch_page(0)
+    worklogs = data.get("worklogs", [])
+    yield from worklogs
+    total = data.get("total", 0)
+    start_at = len(worklogs)
+
+    # The first page reports the total, so the remaining offsets are known up
+    # front and can be requested concurrently. The first page's length is the
+    # page size the server actually honours. Only ``max_pages_ahead`` pages
+    # are requested beyond the one being consumed, so a huge issue never has
+    # all of its pages parsed and buffered at once.
+    if executor is not None and worklogs and start_at < total:
+        page_size = len(worklogs)
+        offsets = iter(range(start_at, total, page_size))
+        pending: Deque[Tuple[int, Future]] = deque()
 
-def _matches_user(worklog: Dict[str, Any], user_identifier: str) -> bool:
-    author = worklog.get("author") or {}
-    candidates = [
-        author.get("accountId"),
-        author.get("name"),
-        author.get("displayName"),
-        author.get("emailAddress"),
-    ]
-    return any(candidate == user_identifier for candidate in candidates if candidate)
+        def request_next_page() -> None:
+            offset = next(offsets, None)
+            if offset is not None:
+                pending.append((offset, executor.submit(fetch_page, offset)))
+
+        for _ in range(max_pages_ahead):
+            request_next_page()
+        try:
+            while pending:
+                offset, future = pending.popleft()
+                worklogs = future.result().get("worklogs", [])
+                request_next_page()
+                yield from worklogs
+                start_at = offset + len(worklogs)
+                if len(worklogs) < page_size:
+                    break
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    # Sequential walk for servers that omit ``total`` or return short pages.
+    while worklogs and start_at < total:
+        data = fetch_page(start_at)
+        worklogs = data.get("worklogs", [])
+        yield from worklogs
+        total = data.get("total", 0)
+        start_at += len(worklogs)
 
 
 def _extract_author_name(worklog: Dict[str, Any]) -> str:
@@ -181,6 +718,13 @@ def _parse_worklog_started_date(worklog: Dict[str, Any]) -> Optional[date]:
     started = worklog.get("started")
     if not started:
         return None
+    # JIRA timestamps start with YYYY-MM-DD; slicing out the date is much
+    # cheaper than strptime, which stays as a fallback for odd formats.
+    if started[4:5] == "-" and started[7:8] == "-":
+        try:
+            return date(int(started[0:4]), int(started[5:7]), int(started[8:10]))
+        except ValueError:
+            pass
     for fmt in ("%Y-%m-%dT%H:%M:%S.%f%z", "%Y-%m-%dT%H:%M:%S%z"):
         try:
             return datetime.strptime(started, fmt).date()
@@ -205,71 +749,304 @@ def _within_date_range(
     return True
 
 
-def fetch_time_entries(
+def _iter_issue_entries(
     config: JiraConfig,
-    issue_keys: Iterable[str],
-    start_date: Optional[date] = None,
-    end_date: Optional[date] = None,
-) -> List[Tuple[str, int, float, str, Optional[date]]]:
-    auth_header = _build_auth_header(config.email, config.api_token)
-    entries: List[Tuple[str, int, float, str, Optional[date]]] = []
-
-    for issue_key in issue_keys:
-        try:
-            for worklog in _iter_worklogs(
-                config.base_url, auth_header, config.api_version, issue_key
+    issue_key: str,
+    worklogs: Iterable[Dict[str, Any]],
+    start_date: Optional[date],
+    end_date: Optional[date],
+    include_zero: bool = False,
+) -> Iterator[TimeEntry]:
+    # ISO-8601 dates sort lexicographically, so out-of-range worklogs can be
+    # rejected on the "started" prefix before any date is built.
+    start_text = start_date.isoformat() if start_date else None
+    end_text = end_date.isoformat() if end_date else None
+    filter_dates = bool(start_text or end_text)
+    # Bind per-worklog lookups to locals once; this loop runs for every
+    # worklog on every issue, most of which belong to other users.
+    worklog_user = config.worklog_user
+    parse_started_date = _parse_worklog_started_date
+    intern = sys.intern
+    try:
+        for worklog in worklogs:
+            # The author match is inlined because it runs for every worklog,
+            # and accountId is checked first as the usual configured value.
+            author = worklog.get("author")
+            if not author or (
+                author.get("accountId") != worklog_user
+                and author.get("emailAddress") != worklog_user
+                and author.get("name") != worklog_user
+                and author.get("displayName") != worklog_user
             ):
-                if not _matches_user(worklog, config.worklog_user):
+                continue
+            time_spent_seconds = int(worklog.get("timeSpentSeconds", 0))
+            if not time_spent_seconds and not include_zero:
+                continue
+            if filter_dates:
+                started = worklog.get("started")
+                if not started:
+                    continue
+                day_text = started[:10]
+                if (start_text and day_text < start_text) or (
+                    end_text and day_text > end_text
+                ):
                     continue
-                started_date = _parse_worklog_started_date(worklog)
+                started_date = parse_started_date(worklog)
                 if not _within_date_range(started_date, start_date, end_date):
                     continue
-                time_spent_seconds = int(worklog.get("timeSpentSeconds", 0))
-                hours = round(time_spent_seconds / 3600, 2)
-                author_name = _extract_author_name(worklog)
-                entries.append(
-                    (issue_key, time_spent_seconds, hours, author_name, started_date)
-                )
+            else:
+                started_date = parse_started_date(worklog)
+            # Every worklog carries its own copy of the author's name; interning
+            # keeps one string per author when entries are held in memory.
+            author_name = intern(_extract_author_name(worklog))
+            yield (issue_key, time_spent_seconds, author_name, started_date)
+    except JiraApiError as exc:
+        if exc.status_code == 404:
+            print(
+                f"Warning: issue {issue_key} not found (HTTP 404). Skipping.",
+                file=sys.stderr,
+            )
+            return
+        raise
+
+
+def _jql_quote(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def _search_issue_keys(
+    session: _JiraSession, api_version: str, jql: str, max_results: int
+) -> List[str]:
+    params = {"jql": jql, "fields": "key", "maxResults": max_results}
+    try:
+        data = _jira_get_json(session, f"/rest/api/{api_version}/search/jql", params)
+    except JiraApiError as exc:
+        # JIRA Server/Data Center only offers the older search endpoint.
+        if exc.status_code != 404:
+            raise
+        data = _jira_get_json(session, f"/rest/api/{api_version}/search", params)
+    return [issue["key"] for issue in data.get("issues", []) if issue.get("key")]
+
+
+def _prefilter_issue_keys(
+    session: _JiraSession,
+    executor: Executor,
+    config: JiraConfig,
+    issue_keys: List[str],
+    start_date: Optional[date],
+    end_date: Optional[date],
+) -> List[str]:
+    """Drop issues that have no worklogs by the configured user.
+
+    One JQL ``worklogAuthor`` search per batch of keys replaces walking every
+    worklog page of issues the user never logged time on. Batches JIRA rejects
+    (e.g. a key that does not exist) are kept unfiltered.
+    """
+    clauses = [f"worklogAuthor = {_jql_quote(config.worklog_user)}"]
+    # worklogDate is evaluated in the searcher's timezone, so pad the range
+    # by a day; the client-side date filter stays authoritative.
+    if start_date:
+        clauses.append(f'worklogDate >= "{(start_date - timedelta(days=1)).isoformat()}"')
+    if end_date:
+        clauses.append(f'worklogDate <= "{(end_date + timedelta(days=1)).isoformat()}"')
+
+    def search(batch: List[str]) -> List[str]:
+        keys_clause = f"key in ({', '.join(_jql_quote(key) for key in batch)})"
+        jql = " AND ".join([keys_clause, *clauses])
+        try:
+            found = {
+                key.upper()
+                for key in _search_issue_keys(session, config.api_version, jql, len(batch))
+            }
         except JiraApiError as exc:
-            if exc.status_code == 404:
-                print(
-                    f"Warning: issue {issue_key} not found (HTTP 404). Skipping.",
-                    file=sys.stderr,
+            if exc.status_code != 400:
+                raise
+            print(
+                f"Warning: JQL prefilter rejected ({exc.message}). "
+                "Fetching these issues unfiltered.",
+                file=sys.stderr,
+            )
+            return batch
+        requested = {key.upper() for key in batch}
+        if not found <= requested:
+            # Moved issues come back under their new key; keep the batch as is.
+            return batch
+        return [key for key in batch if key.upper() in found]
+
+    batches = [
+        issue_keys[index : index + _JQL_BATCH_SIZE]
+        for index in range(0, len(issue_keys), _JQL_BATCH_SIZE)
+    ]
+    return [key for kept in executor.map(search, batches) for key in kept]
+
+
+def fetch_time_entries(
+    config: JiraConfig,
+    issue_keys: Iterable[str],
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    max_workers: Optional[int] = None,
+    jql_prefilter: bool = False,
+    cache_dir: Optional[str] = None,
+    include_zero: bool = False,
+) -> Iterator[TimeEntry]:
+    """Yield matching worklog entries, issue by issue, as they are fetched.
+
+    Worklogs with no time spent are skipped unless ``include_zero`` is set.
+
+    With ``jql_prefilter``, issues without worklogs by the configured user are
+    skipped using a JQL search before any worklogs are fetched. With
+    ``cache_dir``, responses are cached there and revalidated by ETag, and
+    worklog pages are requested for all dates so a moving range still hits
+    the cache.
+    ``max_workers`` overrides ``config.max_workers``.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    if max_workers is None:
+        max_workers = config.max_workers
+
+    with _JiraSession(config.base_url, config.auth_header, cache_dir=cache_dir) as session:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            if jql_prefilter:
+                issue_keys = _prefilter_issue_keys(
+                    session, executor, config, list(issue_keys), start_date, end_date
                 )
-                continue
-            raise
 
-    return entries
+            # One pool serves both issue- and page-level requests. Only this
+            # generator waits on results, so workers never block on each other:
+            # first pages of upcoming issues are requested ahead while the
+            # current issue's remaining pages fan out.
+            upcoming: Deque[Tuple[str, Callable[[int], Dict[str, Any]], Future]] = deque()
+            remaining_keys = iter(issue_keys)
+
+            # With a cache, pages are requested without the server-side date
+            # window so their URLs and ETags stay stable when a rolling
+            # --startdate moves between runs; the client-side filter still
+            # applies the range.
+            started_range = (None, None) if cache_dir else (start_date, end_date)
+
+            def request_next_issue() -> None:
+                for issue_key in remaining_keys:
+                    fetch_page = _worklog_page_fetcher(
+                        session, config.api_version, issue_key, *started_range
+                    )
+                    upcoming.append((issue_key, fetch_page, executor.submit(fetch_page, 0)))
+                    return
+
+            for _ in range(max_workers):
+                request_next_issue()
+            try:
+                while upcoming:
+                    issue_key, fetch_page, first_page = upcoming.popleft()
+                    request_next_issue()
+                    yield from _iter_issue_entries(
+                        config,
+                        issue_key,
+                        _iter_worklog_pages(
+                            fetch_page, executor, first_page, max_workers
+                        ),
+                        start_date,
+                        end_date,
+                        include_zero,
+                    )
+            finally:
+                for _, _, first_page in upcoming:
+                    first_page.cancel()
+
+
+def _prepare_cache_dir(raw_path: str) -> str:
+    path = os.path.expanduser(raw_path)
+    try:
+        os.makedirs(path, exist_ok=True)
+    except OSError as exc:
+        raise ValueError(f"cannot create cache directory {path}: {exc}") from exc
+    if not os.access(path, os.W_OK | os.X_OK):
+        raise ValueError(f"cache directory {path} is not writable")
+    return path
 
 
 def _parse_issue_keys(raw_issues: str) -> List[str]:
     return [key.strip() for key in raw_issues.split(",") if key.strip()]
 
 
+def _format_hours(time_spent_seconds: int) -> str:
+    """Format seconds as hours rounded half-up to two decimals ("1.0", "0.33")."""
+    hundredths = (time_spent_seconds * 100 + 1800) // 3600
+    whole, fraction = divmod(hundredths, 100)
+    if fraction % 10:
+        return f"{whole}.{fraction:02d}"
+    return f"{whole}.{fraction // 10}"
+
+
 def write_csv(
-    output_path: str, entries: Iterable[Tuple[str, int, float, str, Optional[date]]]
-) -> None:
-    with open(output_path, "w", newline="", encoding="utf-8") as file_handle:
+    output_path: str, entries: Iterable[TimeEntry]
+) -> int:
+    """Write ``entries`` as they arrive and return the number of rows written.
+
+    A regular (or not yet existing) output file is replaced only once
+    ``entries`` is exhausted, so a fetch that fails part-way leaves any
+    previous export in place. Symlinks are followed and the old file's mode
+    is kept; devices and pipes such as /dev/stdout are written directly.
+    """
+    import stat
+
+    real_path = os.path.realpath(output_path)
+    try:
+        mode: Optional[int] = os.stat(real_path).st_mode
+    except FileNotFoundError:
+        mode = None
+    if mode is not None and not stat.S_ISREG(mode):
+        return _write_csv_rows(output_path, entries)
+
+    temp_path = f"{real_path}.{os.getpid()}.tmp"
+    try:
+        count = _write_csv_rows(temp_path, entries)
+        if mode is not None:
+            os.chmod(temp_path, stat.S_IMODE(mode))
+        os.replace(temp_path, real_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    return count
+
+
+def _write_csv_rows(path: str, entries: Iterable[TimeEntry]) -> int:
+    import csv
+
+    count = 0
+    # A large buffer amortises write syscalls over many short CSV rows.
+    with open(
+        path, "w", newline="", encoding="utf-8", buffering=_CSV_BUFFER_SIZE
+    ) as file_handle:
         writer = csv.writer(file_handle)
-        writer.writerow(
-            [
-                "JIRA Identifier (Issue Key)",
-                "Time Spent",
-                "Time Spent In Hours",
-                "UserName",
-                "Worklog Date",
-            ]
-        )
-        for issue_key, time_spent_seconds, hours, author_name, worklog_date in entries:
-            writer.writerow(
-                [
-                    issue_key,
-                    time_spent_seconds,
-                    hours,
-                    author_name,
-                    worklog_date.isoformat() if worklog_date else "",
-                ]
-            )
+        writer.writerow(_CSV_HEADER)
+        # Numbers and dates never need quoting, so rows are formatted directly
+        # unless a string field contains a CSV special character.
+        write = file_handle.write
+        date_texts: Dict[Optional[date], str] = {None: ""}
+        hours_texts: Dict[int, str] = {}
+        for issue_key, time_spent_seconds, author_name, worklog_date in entries:
+            date_text = date_texts.get(worklog_date)
+            if date_text is None:
+                date_text = date_texts[worklog_date] = worklog_date.isoformat()
+            hours = hours_texts.get(time_spent_seconds)
+            if hours is None:
+                hours = hours_texts[time_spent_seconds] = _format_hours(time_spent_seconds)
+            if _needs_csv_quoting(issue_key) or _needs_csv_quoting(author_name):
+                writer.writerow(
+                    [issue_key, time_spent_seconds, hours, author_name, date_text]
+                )
+            else:
+                write(
+                    f"{issue_key},{time_spent_seconds},{hours},{author_name},{date_text}\r\n"
+                )
+            count += 1
+    return count
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -309,6 +1086,34 @@ def build_parser() -> argparse.ArgumentParser:
         "--enddate",
         help="End date (YYYY-MM-DD). Only include worklogs on/before this date.",
     )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        help=(
+            "Number of concurrent JIRA requests. Defaults to JIRA_MAX_WORKERS, "
+            f"max_workers in config, or {_DEFAULT_MAX_WORKERS}."
+        ),
+    )
+    parser.add_argument(
+        "--jql-prefilter",
+        action="store_true",
+        help=(
+            "Skip issues without worklogs by the user using a JQL worklogAuthor "
+            "search. The user must be an accountId (Cloud) or username (Server)."
+        ),
+    )
+    parser.add_argument(
+        "--include-zero",
+        action="store_true",
+        help="Also export worklogs with no time spent (skipped by default).",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help=(
+            "Directory for an ETag response cache. Re-runs only download pages "
+            "that changed since the previous export."
+        ),
+    )
     return parser
 
 
@@ -323,13 +1128,13 @@ def main() -> int:
         return 2
 
     if args.user:
-        config = JiraConfig(
-            base_url=config.base_url,
-            email=config.email,
-            api_token=config.api_token,
-            worklog_user=args.user,
-            api_version=config.api_version,
-        )
+        config = replace(config, worklog_user=args.user)
+    if args.workers:
+        try:
+            config = replace(config, max_workers=_parse_max_workers(args.workers))
+        except ValueError as exc:
+            print(f"Configuration error: {exc}", file=sys.stderr)
+            return 2
 
     try:
         start_date = _parse_date_arg(args.startdate, "startdate")
@@ -342,19 +1147,33 @@ def main() -> int:
         print("Configuration error: startdate must be on/before enddate.", file=sys.stderr)
         return 2
 
+    try:
+        cache_dir = _prepare_cache_dir(args.cache_dir) if args.cache_dir else None
+    except ValueError as exc:
+        print(f"Configuration error: {exc}", file=sys.stderr)
+        return 2
+
     issue_keys = _parse_issue_keys(args.issues)
     if not issue_keys:
         print("No valid issue keys provided.", file=sys.stderr)
         return 2
 
+    entries = fetch_time_entries(
+        config,
+        issue_keys,
+        start_date=start_date,
+        end_date=end_date,
+        jql_prefilter=args.jql_prefilter,
+        cache_dir=cache_dir,
+        include_zero=args.include_zero,
+    )
     try:
-        entries = fetch_time_entries(config, issue_keys, start_date=start_date, end_date=end_date)
+        count = write_csv(args.output, entries)
     except RuntimeError as exc:
         print(f"Failed to fetch worklogs: {exc}", file=sys.stderr)
         return 1
 
-    write_csv(args.output, entries)
-    print(f"Wrote {len(entries)} worklog entries to {args.output}")
+    print(f"Wrote {count} worklog entries to {args.output}")
     return 0
 
 